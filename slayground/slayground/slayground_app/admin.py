@@ -1,11 +1,12 @@
 # slayground/slayground/slayground_app/admin.py
 import re
-from datetime import datetime, timedelta
+from datetime import date
 
 from django import forms
 from django.contrib import admin, messages
 from django.contrib.admin.helpers import ActionForm
-from django.utils.html import format_html
+from django.utils.html import escape, format_html
+from django.utils.safestring import mark_safe
 
 from .models import (
     Instructor,
@@ -20,6 +21,19 @@ from .models import (
     EventRegistration,
 )
 
+_SKIP_SPLIT_RE = re.compile(r"[,\s]+")
+_SKIP_DATE_RE = re.compile(r"\d{4}-\d{2}-\d{2}")
+
+
+def _is_autocomplete(request) -> bool:
+    """
+    True for the admin's autocomplete JSON endpoint. It only renders str(obj),
+    so search results there can be narrowed with .only().
+    """
+    match = getattr(request, "resolver_match", None)
+    return match is not None and match.url_name == "autocomplete"
+
+
 # ---------------------------
 # Core admins
 # ---------------------------
@@ -29,12 +43,22 @@ class InstructorAdmin(admin.ModelAdmin):
     list_display = ("name", "instagram_handle", "created_at")
     search_fields = ("name", "instagram_handle")
 
+    def get_search_results(self, request, queryset, search_term):
+        if _is_autocomplete(request):
+            queryset = queryset.only("id", "name")
+        return super().get_search_results(request, queryset, search_term)
+
 
 @admin.register(Location)
 class LocationAdmin(admin.ModelAdmin):
     list_display = ("name", "city", "state", "country")
     search_fields = ("name", "city", "state", "country")
 
+    def get_search_results(self, request, queryset, search_term):
+        if _is_autocomplete(request):
+            queryset = queryset.only("id", "name", "city")
+        return super().get_search_results(request, queryset, search_term)
+
 
 @admin.register(ClassType)
 class ClassTypeAdmin(admin.ModelAdmin):
@@ -43,6 +67,11 @@ class ClassTypeAdmin(admin.ModelAdmin):
     search_fields = ("title",)
     list_filter = ("level",)
 
+    def get_search_results(self, request, queryset, search_term):
+        if _is_autocomplete(request):
+            queryset = queryset.only("id", "title")
+        return super().get_search_results(request, queryset, search_term)
+
 
 # ----- ClassSession admin + actions -----
 
@@ -69,6 +98,7 @@ class ClassSessionAdmin(admin.ModelAdmin):
         "is_published", "recurrence_enabled",
     )
     list_filter = ("class_type", "instructor", "is_published", "start_datetime", "recurrence_enabled")
+    list_select_related = ("class_type", "instructor")
     autocomplete_fields = ("class_type", "instructor", "location")
     search_fields = ("class_type__title", "instructor__name", "location__name")
 
@@ -94,9 +124,13 @@ class ClassSessionAdmin(admin.ModelAdmin):
     action_form = RepeatSessionsActionForm
     actions = ["generate_repeats", "generate_from_recurrence_fields"]
 
+    def get_queryset(self, request):
+        return super().get_queryset(request).with_spots_left()
+
     @admin.action(description="Generate repeats (weekly) from selected (manual options)")
     def generate_repeats(self, request, queryset):
         form = RepeatSessionsActionForm(request.POST)
+        form.fields["action"].choices = self.get_action_choices(request)
         if not form.is_valid():
             self.message_user(request, "Please provide valid repeat options.", level=messages.ERROR)
             return
@@ -106,58 +140,28 @@ class ClassSessionAdmin(admin.ModelAdmin):
         raw_skips = (form.cleaned_data.get("skip_dates") or "").strip()
 
         skip_set = set()
-        if raw_skips:
-            for token in re.split(r"[,\s]+", raw_skips):
-                if not token:
-                    continue
-                try:
-                    skip_set.add(datetime.strptime(token, "%Y-%m-%d").date())
-                except ValueError:
-                    pass
-
-        created = 0
-        skipped = 0
-
-        for seed in queryset:
-            duration = seed.end_datetime - seed.start_datetime
-            for i in range(1, occurrences + 1):
-                start_dt = seed.start_datetime + timedelta(weeks=interval * i)
-                if start_dt.date() in skip_set:
-                    skipped += 1
-                    continue
-                end_dt = start_dt + duration
-
-                exists = ClassSession.objects.filter(
-                    class_type=seed.class_type,
-                    start_datetime=start_dt,
-                ).exists()
-                if exists:
-                    skipped += 1
-                    continue
-
-                ClassSession.objects.create(
-                    class_type=seed.class_type,
-                    instructor=seed.instructor,
-                    location=seed.location,
-                    start_datetime=start_dt,
-                    end_datetime=end_dt,
-                    capacity=seed.capacity,
-                    price_cents=seed.price_cents,
-                    is_published=seed.is_published,
-                    notes=seed.notes,
-                )
-                created += 1
+        for token in _SKIP_SPLIT_RE.split(raw_skips):
+            if not _SKIP_DATE_RE.fullmatch(token):
+                continue
+            try:
+                skip_set.add(date.fromisoformat(token))
+            except ValueError:  # well-formed but impossible, e.g. 2025-02-30
+                pass
+
+        # Plain arguments only, so this can be handed to a worker unchanged.
+        res = queryset.generate_repeats(
+            occurrences=occurrences,
+            every_n_weeks=interval,
+            skip_dates=sorted(d.isoformat() for d in skip_set),
+        )
+        created, skipped = res["created"], res["skipped"]
 
         self.message_user(request, f"Created {created} session(s); skipped {skipped}.", level=messages.INFO)
 
     @admin.action(description="Generate from each session’s recurrence fields")
     def generate_from_recurrence_fields(self, request, queryset):
-        total_created = 0
-        total_skipped = 0
-        for seed in queryset:
-            res = seed.generate_recurrences(default_weeks=12, dry_run=False)
-            total_created += res.get("created", 0)
-            total_skipped += res.get("skipped", 0)
+        res = queryset.generate_recurrences(default_weeks=12)
+        total_created, total_skipped = res["created"], res["skipped"]
         self.message_user(
             request,
             f"Generated {total_created} session(s); skipped {total_skipped}.",
@@ -169,6 +173,7 @@ class ClassSessionAdmin(admin.ModelAdmin):
 class BookingAdmin(admin.ModelAdmin):
     list_display = ("id", "user", "session", "status", "quantity", "paid_cents", "created_at")
     list_filter = ("status", "session__class_type")
+    list_select_related = ("user", "session__class_type")
     search_fields = ("full_name", "email", "stripe_payment_intent")
     autocomplete_fields = ("user", "session")
 
@@ -196,14 +201,15 @@ class MediaItemAdmin(admin.ModelAdmin):
     )
 
     def thumb(self, obj):
-        if obj.image:
-            return format_html('<img src="{}" style="height:40px;width:60px;object-fit:cover;border-radius:6px;border:1px solid #444;" />', obj.image.url)
+        if obj.thumb_url:
+            # Runs once per changelist row; a single escape() is cheaper than format_html.
+            return mark_safe(f'<img src="{escape(obj.thumb_url)}" style="height:40px;width:60px;object-fit:cover;border-radius:6px;border:1px solid #444;" />')
         return "—"
     thumb.short_description = " "
 
     def thumb_large(self, obj):
-        if obj.image:
-            return format_html('<img src="{}" style="max-width:320px;border-radius:8px;border:1px solid #444;" />', obj.image.url)
+        if obj.thumb_url:
+            return format_html('<img src="{}" style="max-width:320px;border-radius:8px;border:1px solid #444;" />', obj.thumb_url)
         return "—"
     thumb_large.short_description = "Preview"
 
@@ -233,5 +239,6 @@ class EventInquiryAdmin(admin.ModelAdmin):
 class EventRegistrationAdmin(admin.ModelAdmin):
     list_display = ("id", "user", "event", "status", "quantity", "paid_cents", "created_at")
     list_filter = ("status", "event__event_type")
+    list_select_related = ("user", "event")
     search_fields = ("full_name", "email", "stripe_payment_intent")
     autocomplete_fields = ("user", "event")
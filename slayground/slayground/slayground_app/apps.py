@@ -4,3 +4,6 @@ from django.apps import AppConfig
 class SlaygroundConfig(AppConfig):
     default_auto_field = 'django.db.models.BigAutoField'
     name = 'slayground.slayground_app'
+
+    def ready(self):
+        from . import signals  # noqa: F401
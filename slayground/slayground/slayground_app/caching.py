@@ -0,0 +1,18 @@
+# slayground/slayground/slayground_app/caching.py
+from uuid import uuid4
+
+from django.core.cache import cache
+
+# The default LocMemCache is per process: a bump only reaches the worker that
+# made the write, and other workers catch up when their entries' TTL expires.
+SCHEDULE_VERSION_KEY = "sg:schedule-version"
+
+
+def schedule_version() -> str:
+    """Token that changes whenever the published schedule may have changed."""
+    return cache.get_or_set(SCHEDULE_VERSION_KEY, lambda: uuid4().hex, timeout=None)
+
+
+def bump_schedule_version() -> None:
+    """Invalidate every cache entry keyed on schedule_version()."""
+    cache.set(SCHEDULE_VERSION_KEY, uuid4().hex, timeout=None)
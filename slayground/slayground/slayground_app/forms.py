@@ -1,12 +1,17 @@
 from __future__ import annotations
-from datetime import datetime
+from datetime import datetime, time
 from django import forms
 from django.utils import timezone
 from django.contrib.auth import get_user_model
 from django.contrib.auth.forms import UserCreationForm
+from django.db.models.functions import Lower
 
 from .models import Booking, ClassSession, ClassType, Instructor, Location, EventInquiry, EventRegistration, Event
 
+_MIDNIGHT = time.min
+_EOD = time.max
+_LEVEL_CHOICES = (("", "Any level"),) + tuple(ClassType.LEVEL_CHOICES)
+
 
 class BookingCreateForm(forms.ModelForm):
     """
@@ -32,6 +37,9 @@ class BookingCreateForm(forms.ModelForm):
         """
         self.session = session
         super().__init__(*args, **kwargs)
+        if session is not None:
+            # Booking.clean() reads the session during model validation.
+            self.instance.session = session
 
     def clean(self):
         cleaned = super().clean()
@@ -43,35 +51,50 @@ class BookingCreateForm(forms.ModelForm):
         if self.session.start_datetime < timezone.now():
             raise forms.ValidationError("This class has already started or finished.")
 
-        qty = cleaned.get("quantity") or 1
-
-        # Capacity check
-        if not self.session.can_accept(qty):
-            self.add_error("quantity", f"Only {self.session.spots_left} spots left.")
-
+        # Capacity is checked once, by Booking.clean() during model validation.
         return cleaned
 
+    def save_multi(self, user, session: ClassSession) -> list[Booking]:
+        """
+        Group bookings: one single-spot Booking per requested spot, written
+        with one bulk_create. Call after is_valid(); like bulk_create itself,
+        this skips Booking.save()/clean(), so capacity is whatever clean() checked.
+        """
+        cd = self.cleaned_data
+        bookings = [
+            Booking(
+                user=user,
+                session=session,
+                full_name=cd["full_name"],
+                email=cd["email"],
+                message=cd.get("message", ""),
+                quantity=1,
+            )
+            for _ in range(cd["quantity"])
+        ]
+        return Booking.objects.bulk_create(bookings, batch_size=100)
+
 class ClassSearchForm(forms.Form):
     """
     Filters for the Classes page.
     All fields optional; combine as a flexible filter.
     """
     class_type = forms.ModelChoiceField(
-        queryset=ClassType.objects.all().order_by("title"),
+        queryset=ClassType.objects.all(),
         required=False,
         empty_label="Any type",
     )
     level = forms.ChoiceField(
-        choices=[("", "Any level")] + list(ClassType.LEVEL_CHOICES),
+        choices=_LEVEL_CHOICES,
         required=False,
     )
     instructor = forms.ModelChoiceField(
-        queryset=Instructor.objects.all().order_by("name"),
+        queryset=Instructor.objects.all(),
         required=False,
         empty_label="Any instructor",
     )
     location = forms.ModelChoiceField(
-        queryset=Location.objects.all().order_by("city", "name"),
+        queryset=Location.objects.all(),
         required=False,
         empty_label="Any location",
     )
@@ -81,21 +104,22 @@ class ClassSearchForm(forms.Form):
     def filter_queryset(self, qs):
         """Apply filters to a ClassSession queryset."""
         cd = self.cleaned_data
+        tz = timezone.get_current_timezone()
+        filters = {}
         if cd.get("class_type"):
-            qs = qs.filter(class_type=cd["class_type"])
+            filters["class_type"] = cd["class_type"]
         if cd.get("level"):
-            qs = qs.filter(class_type__level=cd["level"])
+            filters["class_type__level"] = cd["level"]
         if cd.get("instructor"):
-            qs = qs.filter(instructor=cd["instructor"])
+            filters["instructor"] = cd["instructor"]
         if cd.get("location"):
-            qs = qs.filter(location=cd["location"])
+            filters["location"] = cd["location"]
         if cd.get("date_from"):
-            start = datetime.combine(cd["date_from"], datetime.min.time()).astimezone(timezone.get_current_timezone())
-            qs = qs.filter(start_datetime__gte=start)
+            filters["start_datetime__gte"] = timezone.make_aware(datetime.combine(cd["date_from"], _MIDNIGHT), tz)
         if cd.get("date_to"):
-            end = datetime.combine(cd["date_to"], datetime.max.time()).astimezone(timezone.get_current_timezone())
-            qs = qs.filter(start_datetime__lte=end)
-        return qs
+            filters["start_datetime__lte"] = timezone.make_aware(datetime.combine(cd["date_to"], _EOD), tz)
+        # One filter() call = one queryset clone
+        return qs.filter(**filters) if filters else qs
 
 class QuickSessionCreateForm(forms.Form):
     """
@@ -130,7 +154,8 @@ class SignUpForm(UserCreationForm):
     def clean_email(self):
         email = self.cleaned_data["email"].lower()
         User = get_user_model()
-        if User.objects.filter(email__iexact=email).exists():
+        # LOWER(email) matches the user_email_lower_idx expression index
+        if User.objects.alias(email_lower=Lower("email")).filter(email_lower=email).exists():
             raise forms.ValidationError("An account with this email already exists.")
         return email
     
@@ -156,6 +181,9 @@ class EventRegistrationForm(forms.ModelForm):
     def __init__(self, *args, event: Event | None = None, **kwargs):
         self.event = event
         super().__init__(*args, **kwargs)
+        if event is not None:
+            # EventRegistration.clean() reads the event during model validation.
+            self.instance.event = event
 
     def clean(self):
         cleaned = super().clean()
@@ -163,8 +191,6 @@ class EventRegistrationForm(forms.ModelForm):
             raise forms.ValidationError("Invalid event.")
         if self.event.start_datetime and self.event.start_datetime < timezone.now():
             raise forms.ValidationError("This event has already started or finished.")
-        qty = cleaned.get("quantity") or 1
-        if not self.event.can_accept(qty):
-            self.add_error("quantity", f"Only {self.event.spots_left} spots left.")
+        # Capacity is checked once, by EventRegistration.clean() during model validation.
         return cleaned
     
\ No newline at end of file
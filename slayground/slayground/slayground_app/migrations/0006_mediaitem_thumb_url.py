@@ -0,0 +1,25 @@
+# Generated by Django 5.2.18 on 2026-10-15 21:21
+
+from django.db import migrations, models
+
+
+def backfill_thumb_url(apps, schema_editor):
+    MediaItem = apps.get_model("slayground_app", "MediaItem")
+    for item in MediaItem.objects.exclude(image="").exclude(image__isnull=True).only("id", "image"):
+        MediaItem.objects.filter(pk=item.pk).update(thumb_url=item.image.url)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('slayground_app', '0005_mediaitem_external_url_mediaitem_image_and_more'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='mediaitem',
+            name='thumb_url',
+            field=models.CharField(blank=True, editable=False, max_length=512),
+        ),
+        migrations.RunPython(backfill_thumb_url, migrations.RunPython.noop),
+    ]
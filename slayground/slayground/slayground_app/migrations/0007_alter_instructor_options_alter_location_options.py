@@ -0,0 +1,21 @@
+# Generated by Django 5.2.18 on 2026-10-15 21:21
+
+from django.db import migrations
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('slayground_app', '0006_mediaitem_thumb_url'),
+    ]
+
+    operations = [
+        migrations.AlterModelOptions(
+            name='instructor',
+            options={'ordering': ['name']},
+        ),
+        migrations.AlterModelOptions(
+            name='location',
+            options={'ordering': ['city', 'name']},
+        ),
+    ]
@@ -0,0 +1,30 @@
+# Generated by Django 5.2.18 on 2026-10-15 21:40
+
+from django.conf import settings
+from django.db import migrations, models
+from django.db.models.functions import Lower
+
+# auth.User isn't ours to add Meta.indexes to, so the index is managed here.
+USER_EMAIL_LOWER_INDEX = models.Index(Lower("email"), name="user_email_lower_idx")
+
+
+def add_email_lower_index(apps, schema_editor):
+    User = apps.get_model(settings.AUTH_USER_MODEL)
+    schema_editor.add_index(User, USER_EMAIL_LOWER_INDEX)
+
+
+def remove_email_lower_index(apps, schema_editor):
+    User = apps.get_model(settings.AUTH_USER_MODEL)
+    schema_editor.remove_index(User, USER_EMAIL_LOWER_INDEX)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('slayground_app', '0007_alter_instructor_options_alter_location_options'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.RunPython(add_email_lower_index, remove_email_lower_index),
+    ]
@@ -0,0 +1,17 @@
+# Generated by Django 5.2.18 on 2026-10-15 21:26
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('slayground_app', '0008_user_email_lower_index'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='mediaitem',
+            index=models.Index(fields=['is_active', 'publish_at'], name='slayground__is_acti_e6c0fa_idx'),
+        ),
+    ]
@@ -0,0 +1,17 @@
+# Generated by Django 5.2.18 on 2026-10-15 21:30
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('slayground_app', '0009_mediaitem_slayground__is_acti_e6c0fa_idx'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='classsession',
+            index=models.Index(condition=models.Q(('is_published', True)), fields=['is_published', 'start_datetime'], name='cs_pub_start_idx'),
+        ),
+    ]
@@ -2,12 +2,16 @@
 from __future__ import annotations
 
 from datetime import date, datetime, timedelta
+from functools import cached_property
 
 from django.conf import settings
 from django.core.exceptions import ValidationError
-from django.db import models
+from django.db import models, transaction
+from django.db.models.functions import Coalesce
 from django.utils import timezone
 
+from .caching import bump_schedule_version
+
 
 # -----------------------
 # Shared / utilities
@@ -29,6 +33,9 @@ class Instructor(TimeStampedModel):
     photo = models.ImageField(upload_to="instructors/", blank=True, null=True)
     instagram_handle = models.CharField(max_length=64, blank=True)
 
+    class Meta:
+        ordering = ["name"]
+
     def __str__(self) -> str:
         return self.name
 
@@ -43,6 +50,9 @@ class Location(TimeStampedModel):
     country = models.CharField(max_length=80, default="USA")
     notes = models.TextField(blank=True)
 
+    class Meta:
+        ordering = ["city", "name"]
+
     def __str__(self) -> str:
         return f"{self.name} — {self.city}"
 
@@ -71,6 +81,104 @@ class ClassType(TimeStampedModel):
         return self.title
 
 
+class ClassSessionQuerySet(models.QuerySet):
+    def with_spots_left(self):
+        """Annotate `confirmed_qty` so `spots_left` needs no query per row."""
+        return self.annotate(
+            confirmed_qty=Coalesce(
+                models.Sum("bookings__quantity", filter=models.Q(bookings__status="CONFIRMED")),
+                models.Value(0),
+            ),
+        )
+
+    def generate_repeats(self, *, occurrences: int, every_n_weeks: int = 1, skip_dates=()) -> dict:
+        """
+        Create `occurrences` copies of every session in this queryset, spaced
+        `every_n_weeks` apart, skipping any that land on `skip_dates`
+        (ISO date strings).
+        Collisions with existing sessions are dropped by the
+        unique_classsession_type_start constraint.
+        """
+        skip_set = {date.fromisoformat(d) for d in skip_dates}
+        skipped = 0
+        to_create = []
+        for seed in self:
+            for i in range(1, occurrences + 1):
+                start_dt = seed.start_datetime + timedelta(weeks=every_n_weeks * i)
+                if start_dt.date() in skip_set:
+                    skipped += 1
+                    continue
+                to_create.append(seed._copy_at(start_dt))
+
+        # Count before/after to report how many actually landed.
+        created = 0
+        if to_create:
+            manager = self.model._default_manager
+            starts = [s.start_datetime for s in to_create]
+            matching = manager.filter(
+                class_type_id__in={s.class_type_id for s in to_create},
+                start_datetime__range=(min(starts), max(starts)),
+            )
+            with transaction.atomic():
+                before = matching.count()
+                manager.bulk_create(to_create, batch_size=500, ignore_conflicts=True)
+                created = matching.count() - before
+            bump_schedule_version()  # bulk_create sends no post_save
+        skipped += len(to_create) - created
+
+        return {"created": created, "skipped": skipped}
+
+    def generate_recurrences(self, *, default_weeks: int = 12, dry_run: bool = False) -> dict:
+        """
+        Batched ClassSession.generate_recurrences() for every seed in this
+        queryset: one lookup for colliding sessions and one bulk_create,
+        however many seeds are selected. Rows inserted concurrently are
+        dropped by the unique_classsession_type_start constraint.
+        """
+        skipped = 0
+        planned = []
+        for seed in self:
+            if not seed.recurrence_enabled:
+                continue
+            starts, seed_skipped = seed._recurrence_starts(seed._recurrence_end_date(default_weeks))
+            skipped += seed_skipped
+            planned.extend((seed, start_dt) for start_dt in starts)
+
+        if not planned:
+            return {"created": 0, "skipped": skipped}
+
+        # A range keeps the query to two parameters however many candidates
+        # there are; the set membership test below does the exact matching.
+        manager = self.model._default_manager
+        starts = [start_dt for _, start_dt in planned]
+        matching = manager.filter(
+            class_type_id__in={seed.class_type_id for seed, _ in planned},
+            start_datetime__range=(min(starts), max(starts)),
+        )
+        existing = set(matching.values_list("class_type_id", "start_datetime"))
+
+        to_create = []
+        for seed, start_dt in planned:
+            key = (seed.class_type_id, start_dt)
+            if key in existing:
+                skipped += 1
+                continue
+            existing.add(key)  # two seeds can land on the same slot
+            to_create.append(seed._copy_at(start_dt))
+
+        created = len(to_create)
+        if to_create and not dry_run:
+            # Count before/after to report how many actually landed.
+            with transaction.atomic():
+                before = matching.count()
+                manager.bulk_create(to_create, batch_size=500, ignore_conflicts=True)
+                created = matching.count() - before
+            bump_schedule_version()  # bulk_create sends no post_save
+            skipped += len(to_create) - created
+
+        return {"created": created, "skipped": skipped}
+
+
 class ClassSession(TimeStampedModel):
     """
     A scheduled instance of a ClassType that users can book.
@@ -94,11 +202,18 @@ class ClassSession(TimeStampedModel):
     recurrence_until = models.DateField(null=True, blank=True, help_text="Last date to generate (inclusive).")
     recurrence_skips = models.JSONField(default=list, blank=True, help_text='List of dates (YYYY-MM-DD) to skip')
 
+    objects = ClassSessionQuerySet.as_manager()
+
     class Meta:
         ordering = ["start_datetime"]
         indexes = [
             models.Index(fields=["start_datetime"]),
             models.Index(fields=["class_type", "start_datetime"]),
+            models.Index(
+                fields=["is_published", "start_datetime"],
+                name="cs_pub_start_idx",
+                condition=models.Q(is_published=True),
+            ),
         ]
         constraints = [
             models.UniqueConstraint(
@@ -112,9 +227,11 @@ class ClassSession(TimeStampedModel):
 
     @property
     def spots_left(self) -> int:
-        confirmed = self.bookings.filter(status="CONFIRMED").aggregate(
-            s=models.Sum("quantity")
-        )["s"] or 0
+        confirmed = getattr(self, "confirmed_qty", None)
+        if confirmed is None:
+            confirmed = self.bookings.filter(status="CONFIRMED").aggregate(
+                s=models.Sum("quantity")
+            )["s"] or 0
         return max(self.capacity - confirmed, 0)
 
     def clean(self):
@@ -125,74 +242,59 @@ class ClassSession(TimeStampedModel):
         return qty > 0 and self.spots_left >= qty
 
     # ---- recurrence generator based on this seed ----
+    @cached_property
     def _skip_set(self) -> set[date]:
         out: set[date] = set()
         for v in (self.recurrence_skips or []):
             try:
                 if isinstance(v, str):
-                    out.add(datetime.strptime(v, "%Y-%m-%d").date())
+                    out.add(date.fromisoformat(v))
                 elif isinstance(v, date):
                     out.add(v)
             except ValueError:
                 pass
         return out
 
+    def _copy_at(self, start_dt: datetime) -> ClassSession:
+        """Unsaved copy of this session moved to `start_dt`, keeping its duration."""
+        return ClassSession(
+            class_type_id=self.class_type_id,
+            instructor_id=self.instructor_id,
+            location_id=self.location_id,
+            start_datetime=start_dt,
+            end_datetime=start_dt + (self.end_datetime - self.start_datetime),
+            capacity=self.capacity,
+            price_cents=self.price_cents,
+            is_published=self.is_published,
+            notes=self.notes,
+        )
+
+    def _recurrence_end_date(self, default_weeks: int) -> date:
+        return self.recurrence_until or (self.start_datetime.date() + timedelta(weeks=default_weeks))
+
+    def _recurrence_starts(self, end_date: date) -> tuple[list[datetime], int]:
+        """Start datetimes up to `end_date`, and how many landed on a skip date."""
+        n_weeks = self.recurrence_every_n_weeks
+        if not n_weeks:
+            return [], 0
+        # Adding whole weeks never changes the time of day, so the count is exact.
+        horizon = (end_date - self.start_datetime.date()).days // (7 * n_weeks)
+        candidates = [self.start_datetime + timedelta(weeks=n_weeks * i) for i in range(1, horizon + 1)]
+
+        skip_set = self._skip_set
+        starts = [dt for dt in candidates if dt.date() not in skip_set]
+        return starts, len(candidates) - len(starts)
+
     def generate_recurrences(self, *, default_weeks: int = 12, dry_run: bool = False) -> dict:
         """
         Using this row as a seed, generate future ClassSession rows at the same
         weekday/time every `recurrence_every_n_weeks`, up to `recurrence_until`
         (or default horizon if not set). Skips listed in `recurrence_skips`.
+        Reads the seed as saved; see ClassSessionQuerySet.generate_recurrences().
         """
-        if not self.recurrence_enabled:
-            return {"created": 0, "skipped": 0, "reason": "disabled"}
-
-        end_date = self.recurrence_until or (self.start_datetime.date() + timedelta(weeks=default_weeks))
-        if end_date < self.start_datetime.date():
-            return {"created": 0, "skipped": 0, "reason": "empty-range"}
-
-        duration = self.end_datetime - self.start_datetime
-        skip_set = self._skip_set()
-
-        created = 0
-        skipped = 0
-
-        cursor = self.start_datetime
-        while True:
-            cursor = cursor + timedelta(weeks=self.recurrence_every_n_weeks)
-            if cursor.date() > end_date:
-                break
-
-            if cursor.date() in skip_set:
-                skipped += 1
-                continue
-
-            start_dt = cursor
-            end_dt = start_dt + duration
-
-            exists = ClassSession.objects.filter(
-                class_type=self.class_type,
-                start_datetime=start_dt,
-            ).exists()
-            if exists:
-                skipped += 1
-                continue
-
-            if not dry_run:
-                ClassSession.objects.create(
-                    class_type=self.class_type,
-                    instructor=self.instructor,
-                    location=self.location,
-                    start_datetime=start_dt,
-                    end_datetime=end_dt,
-                    capacity=self.capacity,
-                    price_cents=self.price_cents,
-                    is_published=self.is_published,
-                    notes=self.notes,
-                )
-            created += 1
-
-        return {"created": created, "skipped": skipped, "reason": "ok"}
-
+        return type(self).objects.filter(pk=self.pk).generate_recurrences(
+            default_weeks=default_weeks, dry_run=dry_run
+        )
 
 
 class Booking(TimeStampedModel):
@@ -257,6 +359,15 @@ class ContentCategory(TimeStampedModel):
         return self.name
 
 
+class MediaItemQuerySet(models.QuerySet):
+    def live_for(self, user):
+        """Active, published items; members-only ones are hidden from anonymous users."""
+        qs = self.filter(is_active=True).filter(
+            models.Q(publish_at__isnull=True) | models.Q(publish_at__lte=timezone.now())
+        )
+        return qs if user.is_authenticated else qs.filter(visibility="PUBLIC")
+
+
 class MediaItem(TimeStampedModel):
     VISIBILITY_CHOICES = [
         ("PUBLIC", "Public"),
@@ -273,13 +384,20 @@ class MediaItem(TimeStampedModel):
     audio_file = models.FileField(upload_to="content/audio/", blank=True, null=True)
     attachment = models.FileField(upload_to="content/attachments/", blank=True, null=True)
     external_url = models.URLField(blank=True, help_text="Optional generic link (blog, drive, etc.)")
+    # Denormalized image URL so list pages don't hit the storage backend per row
+    thumb_url = models.CharField(max_length=512, blank=True, editable=False)
 
     visibility = models.CharField(max_length=10, choices=VISIBILITY_CHOICES, default="PUBLIC")
     is_active = models.BooleanField(default=True)
     publish_at = models.DateTimeField(blank=True, null=True)
 
+    objects = MediaItemQuerySet.as_manager()
+
     class Meta:
         ordering = ["-publish_at", "-created_at"]
+        indexes = [
+            models.Index(fields=["is_active", "publish_at"]),
+        ]
 
     def __str__(self) -> str:
         return self.title
@@ -288,6 +406,14 @@ class MediaItem(TimeStampedModel):
     def is_live(self) -> bool:
         return self.is_active and (self.publish_at is None or self.publish_at <= timezone.now())
 
+    def save(self, *args, **kwargs):
+        super().save(*args, **kwargs)
+        # The storage name is only final once the file has been committed.
+        thumb_url = self.image.url if self.image else ""
+        if thumb_url != self.thumb_url:
+            self.thumb_url = thumb_url
+            MediaItem.objects.filter(pk=self.pk).update(thumb_url=thumb_url)
+
     def clean(self):
         if not any([self.image, self.video_url, self.audio_file, self.attachment, self.external_url]):
             raise ValidationError("Add at least one: image, video URL, audio file, attachment, or external URL.")
@@ -295,6 +421,17 @@ class MediaItem(TimeStampedModel):
 # --------------------------------
 # Events: SLAYvents & SLAYbrations
 # --------------------------------
+class EventQuerySet(models.QuerySet):
+    def with_spots_left(self):
+        """Annotate `confirmed_qty` so `spots_left` needs no query per row."""
+        return self.annotate(
+            confirmed_qty=Coalesce(
+                models.Sum("registrations__quantity", filter=models.Q(registrations__status="CONFIRMED")),
+                models.Value(0),
+            ),
+        )
+
+
 class Event(TimeStampedModel):
     EVENT_TYPE_CHOICES = [
         ("PRIVATE", "SLAYvents (Private)"),
@@ -316,6 +453,8 @@ class Event(TimeStampedModel):
 
     is_published = models.BooleanField(default=True)
 
+    objects = EventQuerySet.as_manager()
+
     class Meta:
         ordering = ["-start_datetime", "title"]
         indexes = [
@@ -338,7 +477,9 @@ class Event(TimeStampedModel):
     def spots_left(self) -> int | None:
         if self.capacity <= 0 or not self.is_public:
             return None
-        confirmed = self.registrations.filter(status="CONFIRMED").aggregate(s=models.Sum("quantity"))["s"] or 0
+        confirmed = getattr(self, "confirmed_qty", None)
+        if confirmed is None:
+            confirmed = self.registrations.filter(status="CONFIRMED").aggregate(s=models.Sum("quantity"))["s"] or 0
         return max(self.capacity - confirmed, 0)
 
     def can_accept(self, qty: int) -> bool:
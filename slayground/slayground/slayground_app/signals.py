@@ -0,0 +1,12 @@
+# slayground/slayground/slayground_app/signals.py
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+
+from .caching import bump_schedule_version
+from .models import ClassSession, ClassType
+
+
+@receiver([post_save, post_delete], sender=ClassSession)
+@receiver([post_save, post_delete], sender=ClassType)
+def schedule_changed(sender, **kwargs):
+    bump_schedule_version()
@@ -1,3 +1,341 @@
+from datetime import timedelta
+from unittest import mock
+
+from django.contrib.auth.models import AnonymousUser, User
+from django.db import connection
 from django.test import TestCase
+from django.urls import reverse
+from django.utils import timezone
+
+from . import views
+from .forms import BookingCreateForm, EventRegistrationForm, SignUpForm
+from .models import Booking, ClassSession, ClassType, ContentCategory, Event, MediaItem
+
+
+def make_session(class_type, start, **kwargs) -> ClassSession:
+    return ClassSession.objects.create(
+        class_type=class_type, start_datetime=start, end_datetime=start + timedelta(hours=1), **kwargs
+    )
+
+
+class GenerateRepeatsTests(TestCase):
+    def setUp(self):
+        self.heels = ClassType.objects.create(title="Heels", slug="heels")
+        self.start = timezone.now().replace(microsecond=0) + timedelta(days=1)
+
+    def test_counts_skip_dates(self):
+        seed = make_session(self.heels, self.start)
+        skip = (self.start + timedelta(weeks=2)).date().isoformat()
+
+        res = ClassSession.objects.filter(pk=seed.pk).generate_repeats(occurrences=4, skip_dates=[skip])
+
+        self.assertEqual(res, {"created": 3, "skipped": 1})
+        self.assertEqual(ClassSession.objects.count(), 4)
+
+    def test_collisions_with_existing_rows_and_between_seeds(self):
+        # b sits on a's first repeat; a and b then plan the same +2w and +3w slots.
+        a = make_session(self.heels, self.start)
+        b = make_session(self.heels, self.start + timedelta(weeks=1))
+
+        res = ClassSession.objects.filter(pk__in=[a.pk, b.pk]).generate_repeats(occurrences=3)
+
+        self.assertEqual(res, {"created": 3, "skipped": 3})
+        self.assertEqual(ClassSession.objects.count(), 5)
+
+
+class GenerateRecurrencesTests(TestCase):
+    def setUp(self):
+        self.heels = ClassType.objects.create(title="Heels", slug="heels")
+        self.start = timezone.now().replace(microsecond=0) + timedelta(days=1)
+
+    def make_seed(self, start, weeks: int, **kwargs) -> ClassSession:
+        return make_session(
+            self.heels,
+            start,
+            recurrence_enabled=True,
+            recurrence_until=(self.start + timedelta(weeks=weeks)).date(),
+            **kwargs,
+        )
+
+    def test_counts_skips_and_existing_rows(self):
+        seed = self.make_seed(
+            self.start, 4, recurrence_skips=[(self.start + timedelta(weeks=1)).date().isoformat()]
+        )
+        make_session(self.heels, self.start + timedelta(weeks=3))
+
+        res = ClassSession.objects.filter(pk=seed.pk).generate_recurrences()
+
+        self.assertEqual(res, {"created": 2, "skipped": 2})
+        self.assertEqual(ClassSession.objects.count(), 4)
+
+    def test_collisions_between_seeds(self):
+        a = self.make_seed(self.start, 3)
+        b = self.make_seed(self.start + timedelta(weeks=1), 3)
+
+        res = ClassSession.objects.filter(pk__in=[a.pk, b.pk]).generate_recurrences()
+
+        # a: +1w is b itself, +2w and +3w are new; b: +2w and +3w are a's.
+        self.assertEqual(res, {"created": 2, "skipped": 3})
+        self.assertEqual(ClassSession.objects.count(), 4)
+
+    def test_rerun_creates_nothing(self):
+        seed = self.make_seed(self.start, 2)
+        seed.generate_recurrences()
+
+        self.assertEqual(seed.generate_recurrences(), {"created": 0, "skipped": 2})
+
+    def test_dry_run_writes_nothing(self):
+        seed = self.make_seed(self.start, 2)
+
+        self.assertEqual(seed.generate_recurrences(dry_run=True), {"created": 2, "skipped": 0})
+        self.assertEqual(ClassSession.objects.count(), 1)
+
+    def test_disabled_seed_is_ignored(self):
+        seed = make_session(self.heels, self.start)
+
+        self.assertEqual(seed.generate_recurrences(), {"created": 0, "skipped": 0})
+
+
+class ClassListPagingTests(TestCase):
+    def test_pages_through_sessions_sharing_a_start_time(self):
+        start = timezone.now().replace(microsecond=0) + timedelta(days=1)
+        # unique_classsession_type_start: one class type per session at the same time
+        expected = {
+            make_session(ClassType.objects.create(title=f"Class {i}", slug=f"class-{i}"), start).pk
+            for i in range(13)
+        }
+        url = reverse("sg:class_list")
+
+        first = self.client.get(url)
+        self.assertEqual(len(first.context["sessions"]), 10)
+        self.assertIsNone(first.context["first_query"])
+
+        second = self.client.get(f"{url}?{first.context['next_query']}")
+        self.assertEqual(len(second.context["sessions"]), 3)
+        self.assertIsNone(second.context["next_query"])
+        self.assertEqual(second.context["first_query"], "")
+
+        seen = [s.pk for s in first.context["sessions"]] + [s.pk for s in second.context["sessions"]]
+        self.assertEqual(len(seen), len(set(seen)))
+        self.assertEqual(set(seen), expected)
+
+    def test_bad_cursor_shows_first_page(self):
+        start = timezone.now().replace(microsecond=0) + timedelta(days=1)
+        session = make_session(ClassType.objects.create(title="Heels", slug="heels"), start)
+        url = reverse("sg:class_list")
+
+        for after in ("garbage", "2025-02-30T00:00:00,1", "0001-01-01T00:00:00+05:00,1"):
+            with self.subTest(after=after):
+                response = self.client.get(url, {"after": after})
+                self.assertEqual(response.status_code, 200)
+                self.assertEqual([s.pk for s in response.context["sessions"]], [session.pk])
+
+
+class CalendarFeedBoundsTests(TestCase):
+    def setUp(self):
+        self.heels = ClassType.objects.create(title="Heels", slug="heels")
+        self.start = timezone.now().replace(microsecond=0) + timedelta(days=1)
+        self.url = reverse("sg:calendar_events")
+
+    def feed_ids(self, **params) -> list[int]:
+        response = self.client.get(self.url, params)
+        self.assertEqual(response.status_code, 200)
+        return [event["id"] for event in response.json()]
+
+    def test_start_without_end_stops_at_horizon(self):
+        inside = make_session(self.heels, self.start + timedelta(days=30))
+        make_session(self.heels, self.start + timedelta(days=120))
+
+        self.assertEqual(self.feed_ids(start=self.start.isoformat()), [inside.pk])
+
+    def test_no_bounds_serves_upcoming_within_horizon(self):
+        make_session(self.heels, self.start - timedelta(days=3))
+        upcoming = make_session(self.heels, self.start)
+        make_session(self.heels, self.start + timedelta(days=120))
+
+        self.assertEqual(self.feed_ids(), [upcoming.pk])
+
+    def test_start_near_datetime_max(self):
+        make_session(self.heels, self.start)
+
+        self.assertEqual(self.feed_ids(start="9999-12-31"), [])
+
+    def test_row_cap(self):
+        for weeks in range(3):
+            make_session(self.heels, self.start + timedelta(weeks=weeks))
+
+        with mock.patch.object(views, "_CALENDAR_MAX_EVENTS", 2):
+            self.assertEqual(len(self.feed_ids()), 2)
+
+    def test_impossible_start_keeps_valid_end(self):
+        later = make_session(self.heels, self.start + timedelta(days=200))
+
+        self.assertIn(later.pk, self.feed_ids(start="2025-02-30", end="2100-01-01"))
+
+    def test_bounds_out_of_utc_range_are_ignored(self):
+        upcoming = make_session(self.heels, self.start)
+
+        self.assertEqual(self.feed_ids(end="0001-01-01T00:00:00+05:00"), [upcoming.pk])
+        self.assertEqual(self.feed_ids(start="9999-12-31T23:00:00-05:00"), [upcoming.pk])
+
+    def test_bare_dates_are_accepted(self):
+        upcoming = make_session(self.heels, self.start)
+        day = self.start.date()
+
+        self.assertEqual(self.feed_ids(start=day.isoformat(), end=(day + timedelta(days=1)).isoformat()), [upcoming.pk])
+
+
+class CalendarFeedCacheTests(TestCase):
+    def setUp(self):
+        self.heels = ClassType.objects.create(title="Heels", slug="heels")
+        self.start = timezone.now().replace(microsecond=0) + timedelta(days=1)
+        self.url = reverse("sg:calendar_events")
+
+    def feed_ids(self) -> set[int]:
+        return {event["id"] for event in self.client.get(self.url).json()}
+
+    def test_feed_is_cached_until_the_schedule_version_changes(self):
+        first = make_session(self.heels, self.start)
+        self.assertEqual(self.feed_ids(), {first.pk})
+
+        # bulk_create sends no signals, so the cached feed is still served...
+        (hidden,) = ClassSession.objects.bulk_create([
+            ClassSession(
+                class_type=self.heels,
+                start_datetime=self.start + timedelta(days=1),
+                end_datetime=self.start + timedelta(days=1, hours=1),
+            )
+        ])
+        self.assertEqual(self.feed_ids(), {first.pk})
+
+        # ...until any save or delete bumps the version.
+        first.delete()
+        self.assertEqual(self.feed_ids(), {hidden.pk})
+
+    def test_class_type_change_invalidates(self):
+        make_session(self.heels, self.start)
+        self.client.get(self.url)
+
+        self.heels.title = "Heels II"
+        self.heels.save()
+
+        titles = [event["title"] for event in self.client.get(self.url).json()]
+        self.assertEqual(titles, ["Heels II"])
+
+
+class CapacityValidationTests(TestCase):
+    def setUp(self):
+        self.user = User.objects.create_user("dancer", "dancer@example.com", "pw")
+        self.start = timezone.now().replace(microsecond=0) + timedelta(days=1)
+        self.data = {"full_name": "Dancer", "email": "dancer@example.com", "quantity": 2}
+
+    def test_booking_over_capacity_reports_one_error(self):
+        session = make_session(ClassType.objects.create(title="Heels", slug="heels"), self.start, capacity=2)
+        Booking.objects.create(
+            user=self.user, session=session, full_name="x", email="x@example.com", status="CONFIRMED"
+        )
+        session = ClassSession.objects.with_spots_left().get(pk=session.pk)
+
+        form = BookingCreateForm(self.data, session=session)
+
+        self.assertFalse(form.is_valid())
+        self.assertEqual(form.non_field_errors(), ["Only 1 spots left for this session."])
+        self.assertNotIn("quantity", form.errors)
+
+    def test_registration_over_capacity_reports_one_error(self):
+        event = Event.objects.create(
+            title="Party", slug="party", event_type="PUBLIC", capacity=1, start_datetime=self.start
+        )
+        event = Event.objects.with_spots_left().get(pk=event.pk)
+
+        form = EventRegistrationForm(self.data, event=event)
+
+        self.assertFalse(form.is_valid())
+        self.assertEqual(form.non_field_errors(), ["Only 1 spots left for this event."])
+        self.assertNotIn("quantity", form.errors)
+
+
+class HomeTeaserVisibilityTests(TestCase):
+    def setUp(self):
+        category = ContentCategory.objects.create(name="Tutorials", slug="tutorials")
+        self.public = MediaItem.objects.create(category=category, title="Public")
+        self.members = MediaItem.objects.create(category=category, title="Members", visibility="MEMBERS")
+
+    def teaser(self) -> set[int]:
+        return {item.pk for item in self.client.get(reverse("sg:home")).context["latest_content"]}
+
+    def test_anonymous_users_see_public_items_only(self):
+        self.assertEqual(self.teaser(), {self.public.pk})
+
+    def test_members_see_members_only_items(self):
+        self.client.force_login(User.objects.create_user("dancer", "dancer@example.com", "pw"))
+
+        self.assertEqual(self.teaser(), {self.public.pk, self.members.pk})
+
+
+class ScheduledContentTests(TestCase):
+    def setUp(self):
+        category = ContentCategory.objects.create(name="Tutorials", slug="tutorials")
+        now = timezone.now()
+        self.live = MediaItem.objects.create(category=category, title="Live", publish_at=now - timedelta(hours=1))
+        MediaItem.objects.create(category=category, title="Scheduled", publish_at=now + timedelta(days=1))
+        MediaItem.objects.create(category=category, title="Inactive", is_active=False)
+
+    def test_scheduled_and_inactive_items_are_hidden(self):
+        for url, key in ((reverse("sg:home"), "latest_content"), (reverse("sg:content_hub"), "items")):
+            with self.subTest(url=url):
+                items = self.client.get(url).context[key]
+                self.assertEqual([item.pk for item in items], [self.live.pk])
+
+
+class MediaItemLiveForTests(TestCase):
+    def setUp(self):
+        category = ContentCategory.objects.create(name="Tutorials", slug="tutorials")
+        now = timezone.now()
+        self.public = MediaItem.objects.create(category=category, title="Public")
+        self.members = MediaItem.objects.create(category=category, title="Members", visibility="MEMBERS")
+        MediaItem.objects.create(category=category, title="Scheduled", publish_at=now + timedelta(days=1))
+        MediaItem.objects.create(
+            category=category, title="Scheduled members", visibility="MEMBERS", publish_at=now + timedelta(days=1)
+        )
+        MediaItem.objects.create(category=category, title="Inactive", is_active=False)
+
+    def test_anonymous(self):
+        live = MediaItem.objects.live_for(AnonymousUser())
+
+        self.assertEqual(set(live.values_list("pk", flat=True)), {self.public.pk})
+
+    def test_authenticated(self):
+        live = MediaItem.objects.live_for(User.objects.create_user("dancer", "dancer@example.com", "pw"))
+
+        self.assertEqual(set(live.values_list("pk", flat=True)), {self.public.pk, self.members.pk})
+
+
+class SignUpEmailTests(TestCase):
+    def signup(self, email: str) -> SignUpForm:
+        return SignUpForm({
+            "username": "newdancer",
+            "email": email,
+            "password1": "heels-and-grooves-42",
+            "password2": "heels-and-grooves-42",
+        })
+
+    def test_duplicate_email_is_case_insensitive(self):
+        User.objects.create_user("dancer", "Dancer@Example.com", "pw")
+
+        form = self.signup("dancer@EXAMPLE.com")
+
+        self.assertFalse(form.is_valid())
+        self.assertEqual(form.errors["email"], ["An account with this email already exists."])
+
+    def test_new_email_is_lowercased(self):
+        form = self.signup("New@Example.com")
+
+        self.assertTrue(form.is_valid(), form.errors)
+        self.assertEqual(form.cleaned_data["email"], "new@example.com")
+
+    def test_lower_email_index_exists(self):
+        with connection.cursor() as cursor:
+            constraints = connection.introspection.get_constraints(cursor, User._meta.db_table)
 
-# Create your tests here.
+        self.assertIn("user_email_lower_idx", constraints)
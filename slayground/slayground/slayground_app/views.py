@@ -1,20 +1,24 @@
 from __future__ import annotations
 
-from datetime import datetime
+import hashlib
+from datetime import datetime, time, timedelta, timezone as dt_timezone
 from typing import List
 
 from django.contrib import messages
 from django.contrib.admin.views.decorators import staff_member_required
 from django.contrib.auth import login
 from django.contrib.auth.decorators import login_required
-from django.core.paginator import Paginator
+from django.core.cache import cache
 from django.db import IntegrityError, transaction
+from django.db.models import Q
 from django.http import Http404, HttpRequest, HttpResponse, JsonResponse
 from django.shortcuts import get_object_or_404, redirect, render
 from django.urls import reverse
 from django.utils import timezone
+from django.utils.dateparse import parse_date, parse_datetime
 from django.views.decorators.http import require_GET, require_http_methods
 
+from .caching import schedule_version
 from .forms import (
     BookingCreateForm,
     ClassSearchForm,
@@ -41,17 +45,17 @@ def home(request: HttpRequest) -> HttpResponse:
     """Landing page: show a few upcoming classes and latest content."""
     upcoming = (
         ClassSession.objects.filter(is_published=True, start_datetime__gte=timezone.now())
+        .with_spots_left()
         .select_related("class_type", "instructor", "location")
         .order_by("start_datetime")[:6]
     )
 
+    # Members-only items are hidden from anonymous users in the teaser row
     latest_content = (
-        MediaItem.objects.filter(is_active=True)
+        MediaItem.objects.live_for(request.user)
+        .select_related("category")
         .order_by("-publish_at", "-created_at")[:6]
     )
-    # If the user is not authenticated, hide members-only items in the teaser row
-    if not request.user.is_authenticated:
-        latest_content = [m for m in latest_content if m.visibility == "PUBLIC"]
 
     return render(request, "sg/home.html", {
         "upcoming": upcoming,
@@ -65,29 +69,68 @@ def about(request: HttpRequest) -> HttpResponse:
     return render(request, "sg/about.html")
 
 
+_CLASS_LIST_PAGE_SIZE = 10
+
+
+def _parse_class_cursor(value: str | None):
+    """
+    Decode an `after` cursor ("<iso start>,<id>"); None if missing, malformed,
+    or out of range once converted to UTC for the database.
+    """
+    if not value:
+        return None
+    start_raw, _, id_raw = value.rpartition(",")
+    try:
+        start_dt = datetime.fromisoformat(start_raw)
+        if timezone.is_naive(start_dt):
+            start_dt = timezone.make_aware(start_dt)
+        start_dt.astimezone(dt_timezone.utc)
+        return start_dt, int(id_raw)
+    except (ValueError, OverflowError):
+        return None
+
+
 @require_http_methods(["GET"])
 def class_list(request: HttpRequest) -> HttpResponse:
     """
-    Classes index with flexible filtering + pagination.
+    Classes index with flexible filtering + keyset pagination.
     Default view shows upcoming, published sessions.
     """
     qs = (
         ClassSession.objects.filter(is_published=True, start_datetime__gte=timezone.now())
+        .with_spots_left()
         .select_related("class_type", "instructor", "location")
-        .order_by("start_datetime")
+        .order_by("start_datetime", "id")
     )
 
     form = ClassSearchForm(request.GET or None)
     if form.is_valid():
         qs = form.filter_queryset(qs)
 
-    paginator = Paginator(qs, 10)
-    page_obj = paginator.get_page(request.GET.get("page"))
+    # Keyset pagination on (start_datetime, id): no COUNT(*) per page view.
+    cursor = _parse_class_cursor(request.GET.get("after"))
+    if cursor:
+        after_start, after_id = cursor
+        qs = qs.filter(Q(start_datetime__gt=after_start) | Q(start_datetime=after_start, id__gt=after_id))
+
+    sessions = list(qs[:_CLASS_LIST_PAGE_SIZE + 1])
+    next_query = first_query = None
+    if len(sessions) > _CLASS_LIST_PAGE_SIZE:
+        sessions = sessions[:_CLASS_LIST_PAGE_SIZE]
+        last = sessions[-1]
+        params = request.GET.copy()
+        params["after"] = f"{last.start_datetime.isoformat()},{last.id}"
+        next_query = params.urlencode()
+    if cursor:
+        params = request.GET.copy()
+        params.pop("after", None)
+        first_query = params.urlencode()
 
     return render(request, "sg/class_list.html", {
         "form": form,
-        "page_obj": page_obj,
-        "sessions": page_obj.object_list,
+        "sessions": sessions,
+        "next_query": next_query,
+        "first_query": first_query,
     })
 
 
@@ -95,7 +138,7 @@ def class_list(request: HttpRequest) -> HttpResponse:
 def class_detail(request: HttpRequest, pk: int) -> HttpResponse:
     """Detail page for a single scheduled session."""
     session = get_object_or_404(
-        ClassSession.objects.select_related("class_type", "instructor", "location"),
+        ClassSession.objects.with_spots_left().select_related("class_type", "instructor", "location"),
         pk=pk,
         is_published=True,
     )
@@ -109,7 +152,7 @@ def book_session(request: HttpRequest, session_id: int) -> HttpResponse:
     Booking form:
     """
     session = get_object_or_404(
-        ClassSession.objects.select_related("class_type", "instructor", "location"),
+        ClassSession.objects.with_spots_left().select_related("class_type", "instructor", "location"),
         pk=session_id,
         is_published=True,
     )
@@ -145,10 +188,11 @@ def content_hub(request: HttpRequest) -> HttpResponse:
     - Lists items, hiding members-only items for anonymous users
     """
     categories = ContentCategory.objects.order_by("name")
-    items_qs = MediaItem.objects.filter(is_active=True).order_by("-publish_at", "-created_at")
-
-    if not request.user.is_authenticated:
-        items_qs = items_qs.filter(visibility="PUBLIC")
+    items_qs = (
+        MediaItem.objects.live_for(request.user)
+        .select_related("category")
+        .order_by("-publish_at", "-created_at")
+    )
 
     return render(request, "sg/content_hub.html", {
         "categories": categories,
@@ -160,6 +204,32 @@ def content_hub(request: HttpRequest) -> HttpResponse:
 # Calendar
 # ---------------------------
 
+_CALENDAR_HORIZON = timedelta(days=90)  # default window when no `end` is given
+_CALENDAR_MAX_EVENTS = 1000
+_CALENDAR_CACHE_SECONDS = 60
+
+
+def _parse_calendar_bound(value: str, tz) -> datetime | None:
+    """
+    Parse a FullCalendar `start`/`end` param (ISO datetime, or a bare date).
+    None if unrecognised, well-formed but impossible (e.g. 2025-02-30), or
+    out of range once converted to UTC for the database.
+    """
+    try:
+        dt = parse_datetime(value)
+        if dt is None:
+            day = parse_date(value)
+            if day is None:
+                return None
+            dt = datetime.combine(day, time.min)
+        if timezone.is_naive(dt):
+            dt = timezone.make_aware(dt, tz)
+        dt.astimezone(dt_timezone.utc)
+    except (ValueError, OverflowError):
+        return None
+    return dt
+
+
 @require_GET
 def calendar_view(request: HttpRequest) -> HttpResponse:
     return render(request, "sg/calendar.html")
@@ -171,7 +241,7 @@ def calendar_events(request: HttpRequest) -> JsonResponse:
     start_param = request.GET.get("start")
     end_param = request.GET.get("end")
 
-    events_qs = ClassSession.objects.filter(is_published=True).select_related("class_type")
+    events_qs = ClassSession.objects.filter(is_published=True)
     now = timezone.now()
 
     if not start_param and not end_param:
@@ -179,29 +249,47 @@ def calendar_events(request: HttpRequest) -> JsonResponse:
 
     # Apply range filters if provided
     tz = timezone.get_current_timezone()
-    try:
-        if start_param:
-            start_dt = datetime.fromisoformat(start_param)
-            if timezone.is_naive(start_dt):
-                start_dt = timezone.make_aware(start_dt, tz)
+    start_dt = end_dt = None
+    if start_param:
+        start_dt = _parse_calendar_bound(start_param, tz)
+        if start_dt:
             events_qs = events_qs.filter(start_datetime__gte=start_dt)
-        if end_param:
-            end_dt = datetime.fromisoformat(end_param)
-            if timezone.is_naive(end_dt):
-                end_dt = timezone.make_aware(end_dt, tz)
+    if end_param:
+        end_dt = _parse_calendar_bound(end_param, tz)
+        if end_dt:
             events_qs = events_qs.filter(start_datetime__lte=end_dt)
-    except ValueError:
-        pass
-
-    events: List[dict] = []
-    for s in events_qs.order_by("start_datetime"):
-        events.append({
-            "id": s.id,
-            "title": s.class_type.title,
-            "start": s.start_datetime.isoformat(),
-            "end": s.end_datetime.isoformat(),
-            "url": reverse("sg:class_detail", kwargs={"pk": s.id}),
-        })
+
+    # Never serve an open-ended feed
+    if end_dt is None:
+        try:
+            horizon_end = (start_dt or now) + _CALENDAR_HORIZON
+        except OverflowError:  # start within the horizon of datetime.max
+            horizon_end = datetime.max.replace(tzinfo=dt_timezone.utc)
+        events_qs = events_qs.filter(start_datetime__lte=horizon_end)
+
+    def build_events() -> List[dict]:
+        # Resolve the detail URL once and splice ids in, rather than reverse() per row
+        url_head, _, url_tail = reverse("sg:class_detail", kwargs={"pk": 0}).rpartition("0")
+        # Plain dicts straight from .values(): no model instances for a JSON feed
+        rows = (
+            events_qs.order_by("start_datetime")
+            .values("id", "start_datetime", "end_datetime", "class_type__title")[:_CALENDAR_MAX_EVENTS]
+        )
+        return [
+            {
+                "id": r["id"],
+                "title": r["class_type__title"],
+                "start": r["start_datetime"].isoformat(),
+                "end": r["end_datetime"].isoformat(),
+                "url": f"{url_head}{r['id']}{url_tail}",
+            }
+            for r in rows
+        ]
+
+    # Same feed for every visitor; schedule edits rotate the version (see signals.py).
+    params_digest = hashlib.md5(f"{start_param}|{end_param}".encode(), usedforsecurity=False).hexdigest()
+    cache_key = f"sg:calendar:{schedule_version()}:{params_digest}"
+    events = cache.get_or_set(cache_key, build_events, _CALENDAR_CACHE_SECONDS)
     return JsonResponse(events, safe=False)
 
 
@@ -262,7 +350,12 @@ def slayvents(request: HttpRequest) -> HttpResponse:
         inquiry = form.save()
         messages.success(request, "Thank you! We’ll be in touch to plan your SLAYvent 🎉")
         return redirect("sg:slayvents")
-    templates = Event.objects.filter(event_type="PRIVATE", is_published=True).order_by("title")[:6]
+    # Only the columns the theme cards render
+    templates = (
+        Event.objects.filter(event_type="PRIVATE", is_published=True)
+        .only("title", "event_type", "description", "banner_image")
+        .order_by("title")[:6]
+    )
     return render(request, "sg/slayvents.html", {"form": form, "templates": templates})
 
 # -------- SLAYbrations (public) --------
@@ -273,13 +366,23 @@ def slaybrations_list(request: HttpRequest) -> HttpResponse:
 
 @require_GET
 def slaybrations_detail(request: HttpRequest, slug: str) -> HttpResponse:
-    event = get_object_or_404(Event, slug=slug, event_type="PUBLIC", is_published=True)
+    event = get_object_or_404(
+        Event.objects.with_spots_left().select_related("location"),
+        slug=slug,
+        event_type="PUBLIC",
+        is_published=True,
+    )
     return render(request, "sg/slaybrations_detail.html", {"event": event})
 
 @login_required
 @require_http_methods(["GET", "POST"])
 def slaybrations_register(request: HttpRequest, slug: str) -> HttpResponse:
-    event = get_object_or_404(Event, slug=slug, event_type="PUBLIC", is_published=True)
+    event = get_object_or_404(
+        Event.objects.with_spots_left(),
+        slug=slug,
+        event_type="PUBLIC",
+        is_published=True,
+    )
     form = EventRegistrationForm(request.POST or None, event=event)
     if request.method == "POST" and form.is_valid():
         reg = form.save(commit=False)